@@ -1,7 +1,8 @@
 # app/routers/ai.py
 from fastapi import APIRouter
 from app.models import LoveLetterRequest
-from app.services.llm import generate_gpt_response
+from app.services.llm import generate_gpt_response, is_ai_failure
+from app.services import archive_store
 import random
 
 router = APIRouter(
@@ -42,9 +43,15 @@ def generate_love_letter(request: LoveLetterRequest):
 
     ai_result = generate_gpt_response(system_instruction, user_prompt)
 
+    # Keep it in the archive (skip errors)
+    entry_id = None
+    if not is_ai_failure(ai_result):
+        entry_id = archive_store.try_save_entry("letter", ai_result, mood=request.mood)
+
     return {
         "status": "success",
         "recipient": nickname,
         "mood_detected": request.mood,
-        "ai_message": ai_result
+        "ai_message": ai_result,
+        "archive_id": entry_id
     }
\ No newline at end of file
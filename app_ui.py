@@ -7,11 +7,19 @@ import math
 import json
 import os
 import random
-import requests # Only for Weather
+import requests # Only for ImgBB
+import weather
+import archive_store
+import profiler
+from speculate import Speculator
+from late_results import LateResults
 from groq import Groq
 from streamlit_gsheets import GSheetsConnection
 
 # --- CONFIG ---
+SPECULATIVE_SETTLE_SECS = 1.5   # Selection must sit still this long before we pre-plan
+SPECULATIVE_MAX_CALLS = 5       # Max speculative AI calls per session
+DATE_AI_BUDGET_SECS = 4         # Max wait for the AI date before showing a backup idea
 NEXT_MEET_DATE = datetime(2026, 5, 20) 
 MY_LAT, MY_LON = 22.2988, 114.1722   # Hong Kong
 HER_LAT, HER_LON = 51.2955, 1.0586   # Canterbury
@@ -40,6 +48,10 @@ def generate_groq_response(system_prompt, user_prompt):
     except Exception as e:
         return f"AI Error: {str(e)}"
 
+def is_ai_failure(text):
+    """True for the error strings above (missing key, API errors, quota), so we never show/save them as AI output."""
+    return text.startswith(("AI Error", "⚠️ Error")) or "Quota exceeded" in text
+
 # --- 📸 IMAGE UPLOAD ENGINE (ImgBB) ---
 def upload_to_imgbb(image_file):
     """Uploads binary image data to ImgBB and returns the URL."""
@@ -63,8 +75,8 @@ def upload_to_imgbb(image_file):
 def get_db_connection():
     return st.connection("gsheets", type=GSheetsConnection)
 
-# FIX 1: Add Caching to prevent Lag on every click
-@st.cache_data(ttl=60)
+# FIX 1: Add Caching to prevent Lag on every click (profiler counts hits/misses)
+@profiler.cache_data(ttl=60)
 def load_db():
     """Reads data from Google Sheet"""
     try:
@@ -142,9 +154,14 @@ def get_ai_letter(mood):
     
     user_prompt = f"Write a note about this specific feeling: {mood}. Keep it under 80 words."
 
-    return generate_groq_response(system_instruction, user_prompt)
+    letter = generate_groq_response(system_instruction, user_prompt)
+    # Save real letters to the archive (not error messages)
+    if not is_ai_failure(letter):
+        archive_store.try_save_entry("letter", letter, mood=mood)
+    return letter
 
-def get_ai_date(duration, vibe):
+def generate_ai_date(duration, vibe):
+    """Raw AI call for a date idea. Returns None if the AI failed."""
     system_instruction = (
         "You are an expert dating coach for long-distance couples. "
         "Suggest ONE creative, specific virtual date idea based on the user's constraints. "
@@ -162,16 +179,35 @@ def get_ai_date(duration, vibe):
     
     user_prompt = f"Plan a date with this Duration: {duration}. And this Vibe: {vibe}."
     
-    # 1. Try AI
     ai_result = generate_groq_response(system_instruction, user_prompt)
-    
-    # 2. Check for Failure
-    if "AI Error" in ai_result or "Quota exceeded" in ai_result:
-        # Fallback Logic
+    if is_ai_failure(ai_result):
+        return None
+    return ai_result
+
+def finish_ai_date(duration, vibe, ai_result):
+    """Falls back to the backup list if the AI failed, otherwise archives the idea."""
+    if ai_result is None:
         return get_backup_date(duration, vibe)
-    
+    archive_store.try_save_entry("date", ai_result, vibe=vibe, duration=duration)
     return ai_result
 
+# One shared instance across reruns/sessions, so late answers aren't lost
+@st.cache_resource
+def get_late_dates():
+    return LateResults(generate_ai_date, budget=DATE_AI_BUDGET_SECS)
+
+def get_ai_date(duration, vibe):
+    """
+    Returns (idea, pending_ticket). If the AI is slower than the budget we
+    return a backup idea right away plus a ticket for the late AI one.
+    """
+    # 1. Try AI (within the budget)
+    answered, value = get_late_dates().get((duration, vibe))
+    if answered:
+        # 2. Fallback if it failed
+        return finish_ai_date(duration, vibe, value), None
+    return get_backup_date(duration, vibe), value
+
 # --- BACKUP DATE SYSTEM ---
 BACKUP_DATES = [
     {"duration": "30 Mins", "vibe": "Lazy", "idea": "**Coffee & Crossword**\nFind a crossword online (like NYT mini). Screen share and solve it together while sipping coffee. No rush, just teamwork."},
@@ -189,21 +225,82 @@ def get_backup_date(duration, vibe):
 # --- APP SETUP ---
 st.set_page_config(page_title="LDR Dashboard", page_icon="❤️", layout="wide", initial_sidebar_state="collapsed")
 
+# Debug timings (only when opened with ?debug=1)
+profiler.begin_rerun()
+
 # FIX 3: Initialize Session State to prevent glitches
 if 'generated_letter' not in st.session_state:
     st.session_state.generated_letter = None
 if 'generated_date' not in st.session_state:
     st.session_state.generated_date = None
+if 'date_pending' not in st.session_state:
+    st.session_state.date_pending = None
+if 'date_speculator' not in st.session_state:
+    # Speculative calls just warm up the shared LateResults, the click picks them up from there.
+    # Resolve it here on the script thread: the speculator's background thread has no Streamlit context.
+    late_dates = get_late_dates()
+    st.session_state.date_speculator = Speculator(
+        lambda d, v: late_dates.prefetch((d, v)),
+        settle_delay=SPECULATIVE_SETTLE_SECS,
+        max_calls=SPECULATIVE_MAX_CALLS,
+    )
 
 # FIX 4: Callback functions to handle clicks without glitching
 def handle_letter_click(mood_text):
-    st.session_state.generated_letter = get_ai_letter(mood_text)
+    with profiler.section("groq_letter", callback=True):
+        st.session_state.generated_letter = get_ai_letter(mood_text)
 
 def handle_date_click():
     # Retrieve current selection from session state
     d = st.session_state.date_duration
     v = st.session_state.date_vibe
-    st.session_state.generated_date = get_ai_date(d, v)
+    # The click makes the real call now, so a guess that's still settling must not spend another one
+    st.session_state.date_speculator.cancel_all()
+    with profiler.section("groq_date", callback=True):
+        # Picks up a speculative/late answer for (d, v) if one is already running or done
+        idea, ticket = get_ai_date(d, v)
+    st.session_state.generated_date = idea
+    st.session_state.date_pending = (ticket, d, v) if ticket else None
+
+def handle_date_selection_change():
+    # Selection changed: start planning for it in the background (cancels older guesses)
+    if st.session_state.get("date_speculative"):
+        st.session_state.date_speculator.speculate((st.session_state.date_duration, st.session_state.date_vibe))
+    else:
+        # Switched off: don't let a guess that's still settling spend a call
+        st.session_state.date_speculator.cancel_all()
+
+def handle_reshow_click(entry):
+    # Re-show a saved entry without another AI call
+    if entry["kind"] == "letter":
+        st.session_state.generated_letter = entry["content"]
+    else:
+        st.session_state.generated_date = entry["content"]
+        st.session_state.date_pending = None
+
+def render_date_card():
+    pending = st.session_state.date_pending
+    if pending:
+        ticket, d, v = pending
+        status, _, ai_result = get_late_dates().poll(ticket)
+        if status == "ready":
+            st.session_state.generated_date = finish_ai_date(d, v, ai_result)
+        if status != "pending":
+            st.session_state.date_pending = None
+            # Full rerun so the card is drawn without the polling fragment
+            st.rerun()
+
+    if st.session_state.generated_date:
+        st.markdown(f"""
+        <div class="date-card">
+        {st.session_state.generated_date.replace(chr(10), '<br>')}
+        </div>
+        """, unsafe_allow_html=True)
+    if st.session_state.date_pending:
+        st.caption("📦 Backup idea for now, the AI one will swap in when it's ready ⏳")
+
+def handle_favourite_click(entry_id, value):
+    archive_store.set_favourite(entry_id, value)
 
 # --- 🎨 VISUAL STYLING (CSS FIXED) ---
 st.markdown("""
@@ -319,15 +416,12 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
     return int(R * c)
 
-# FIX 5: Cache weather to prevent lag
-@st.cache_data(ttl=3600)
+# FIX 5: Weather comes from the shared disk cache (survives restarts, refreshed in the background)
 def get_weather(lat, lon):
-    try:
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-        resp = requests.get(url, timeout=5)
-        return resp.json()["current_weather"]
-    except:
+    data = weather.get_weather(lat, lon)
+    if data is None:
         return {"temperature": "--"}
+    return data
 
 def get_rating_color(rating):
     if rating >= 8: return "#69F0AE" 
@@ -338,9 +432,12 @@ def get_rating_color(rating):
 st.title("❤️ Relationship Sync")
 
 # 1. LOAD DATA (FROM GOOGLE SHEETS)
-db = load_db()
-w_my = get_weather(MY_LAT, MY_LON)
-w_her = get_weather(HER_LAT, HER_LON)
+with profiler.section("load_db"):
+    db = load_db()
+with profiler.section(f"weather_{MY_CITY}"):
+    w_my = get_weather(MY_LAT, MY_LON)
+with profiler.section(f"weather_{HER_CITY}"):
+    w_her = get_weather(HER_LAT, HER_LON)
 
 # 2. SYNC CARDS
 c1, c2 = st.columns(2)
@@ -378,7 +475,8 @@ with st.expander("📝 Update Status"):
             if msg:
                 with st.spinner("Syncing to Cloud..."):
                     # Call the new Google Sheets save function
-                    success = save_db(who, msg, rate)
+                    with profiler.section("save_db"):
+                        success = save_db(who, msg, rate)
                     if success:
                         st.success("Updated!")
                         st.rerun()
@@ -389,7 +487,7 @@ st.divider()
 st.subheader("🌍 Live Connection")
 col_map, col_info = st.columns([2.5, 1])
 
-with col_map:
+with col_map, profiler.section("pydeck_map"):
     map_df = pd.DataFrame({"start_lat": [MY_LAT], "start_lon": [MY_LON], "end_lat": [HER_LAT], "end_lon": [HER_LON]})
     layer = pdk.Layer(
         "ArcLayer", data=map_df,
@@ -435,7 +533,7 @@ with col_info:
 # 5. FEATURES TABS
 st.divider()
 # FIX 6: Reorder Tabs (Love Letter first, Locket last to prevent glitches)
-tab1, tab2, tab3 = st.tabs(["💌 Anytime Love Letter", "🎲 AI Date Planner", "📸 Locket"])
+tab1, tab2, tab_archive, tab3 = st.tabs(["💌 Anytime Love Letter", "🎲 AI Date Planner", "📚 Archive", "📸 Locket"])
 
 # --- TAB 1: LOVE LETTER ---
 with tab1:
@@ -463,19 +561,82 @@ with tab2:
     col_d1, col_d2 = st.columns(2)
     # FIX 8: Add keys to selectboxes so we can read them in the callback
     with col_d1:
-        date_duration = st.selectbox("How much time?", ["30 Mins", "1 Hour", "2 Hours", "All Night"], key="date_duration")
+        date_duration = st.selectbox("How much time?", ["30 Mins", "1 Hour", "2 Hours", "All Night"], key="date_duration", on_change=handle_date_selection_change)
     with col_d2:
-        date_vibe = st.selectbox("Vibe?", ["Lazy", "Active", "Romantic & Sexy", "Deep Talk", "Gaming"], key="date_vibe")
+        date_vibe = st.selectbox("Vibe?", ["Lazy", "Active", "Romantic & Sexy", "Deep Talk", "Gaming"], key="date_vibe", on_change=handle_date_selection_change)
+
+    # Opt-in: pre-plan in the background while you're still choosing
+    st.toggle("⚡ Plan ahead while I choose", key="date_speculative", on_change=handle_date_selection_change)
+    if st.session_state.date_speculative:
+        spec = st.session_state.date_speculator
+        st.caption(f"{spec.calls_used}/{spec.max_calls} background plans used this session")
     
     # FIX 9: Use on_click for Date Planner
     st.button("Plan Our Date 🎟️", use_container_width=True, on_click=handle_date_click)
             
-    if st.session_state.generated_date:
-        st.markdown(f"""
-        <div class="date-card">
-        {st.session_state.generated_date.replace(chr(10), '<br>')}
-        </div>
-        """, unsafe_allow_html=True)
+    # Swap in the late AI idea when it arrives (polls only while one is pending)
+    if st.session_state.date_pending:
+        st.fragment(run_every=2)(render_date_card)()
+    else:
+        render_date_card()
+
+# --- TAB: ARCHIVE (Every letter & date we've generated) ---
+with tab_archive:
+    st.markdown("### 📚 Our Archive")
+    ARCHIVE_PAGE_SIZE = 10
+
+    col_a1, col_a2, col_a3 = st.columns([2, 1, 1])
+    with col_a1:
+        arch_query = st.text_input("Search", placeholder="pizza, hug, movie night...", key="arch_query")
+    with col_a2:
+        arch_kind = st.selectbox("Type", ["All", "Letters", "Dates"], key="arch_kind")
+    with col_a3:
+        arch_mood = st.selectbox("Mood", ["Any"] + archive_store.list_values("mood"), key="arch_mood")
+
+    col_a4, col_a5, col_a6, col_a7 = st.columns(4)
+    with col_a4:
+        arch_vibe = st.selectbox("Vibe", ["Any"] + archive_store.list_values("vibe"), key="arch_vibe")
+    with col_a5:
+        arch_duration = st.selectbox("Duration", ["Any"] + archive_store.list_values("duration"), key="arch_duration")
+    with col_a6:
+        arch_since = st.date_input("Since", value=None, key="arch_since")
+    with col_a7:
+        arch_page = st.number_input("Page", min_value=1, value=1, step=1, key="arch_page")
+
+    arch_favs = st.checkbox("⭐ Favourites only", key="arch_favs")
+
+    found = archive_store.search_entries(
+        query=arch_query,
+        kind={"Letters": "letter", "Dates": "date"}.get(arch_kind),
+        mood=None if arch_mood == "Any" else arch_mood,
+        vibe=None if arch_vibe == "Any" else arch_vibe,
+        duration=None if arch_duration == "Any" else arch_duration,
+        date_from=arch_since.isoformat() if arch_since else None,
+        favourites_only=arch_favs,
+        page=arch_page,
+        per_page=ARCHIVE_PAGE_SIZE,
+    )
+    total_pages = max(1, math.ceil(found["total"] / ARCHIVE_PAGE_SIZE))
+    st.caption(f"{found['total']} saved • page {found['page']} of {total_pages}")
+
+    if not found["results"]:
+        st.info("Nothing here yet")
+
+    for entry in found["results"]:
+        label = "💌 Letter" if entry["kind"] == "letter" else "🎟️ Date"
+        tags = " • ".join(t for t in (entry["mood"], entry["vibe"], entry["duration"]) if t)
+        with st.expander(f"{'⭐ ' if entry['favourite'] else ''}{label} — {tags} ({entry['created_at']} UTC)"):
+            st.markdown(entry["content"])
+            col_b1, col_b2 = st.columns(2)
+            with col_b1:
+                st.button("Show Again 🔁", key=f"reshow_{entry['id']}", on_click=handle_reshow_click, args=(entry,))
+            with col_b2:
+                st.button(
+                    "Unfavourite" if entry["favourite"] else "Favourite ⭐",
+                    key=f"fav_{entry['id']}",
+                    on_click=handle_favourite_click,
+                    args=(entry["id"], not entry["favourite"]),
+                )
 
 # --- TAB 3: LOCKET (Moved to End) ---
 with tab3:
@@ -507,7 +668,8 @@ with tab3:
         if st.button("Post to Locket 📨", use_container_width=True):
             with st.spinner("Uploading to cloud..."):
                 # 1. Upload to ImgBB
-                img_url = upload_to_imgbb(photo_input)
+                with profiler.section("imgbb_upload"):
+                    img_url = upload_to_imgbb(photo_input)
                 
                 if img_url:
                     # 2. Save URL to Google Sheet (re-using save_db logic but only updating photo)
@@ -520,3 +682,7 @@ with tab3:
                     if success:
                         st.success("Posted!")
                         st.rerun()
+
+# --- DEBUG PROFILER PANEL ---
+profiler.end_rerun()
+profiler.render_sidebar()
@@ -0,0 +1,44 @@
+# app/routers/archive.py
+from fastapi import APIRouter, HTTPException
+from datetime import date
+from typing import Literal, Optional
+from app.services import archive_store
+
+router = APIRouter(
+    prefix="/archive",
+    tags=["Letter & Date Archive"]
+)
+
+@router.get("/search")
+def search_archive(
+    q: Optional[str] = None,
+    kind: Optional[Literal["letter", "date"]] = None,
+    mood: Optional[str] = None,
+    vibe: Optional[str] = None,
+    duration: Optional[str] = None,
+    date_from: Optional[date] = None, # YYYY-MM-DD, inclusive
+    date_to: Optional[date] = None,   # YYYY-MM-DD, inclusive
+    favourites: bool = False,
+    page: int = 1,
+    per_page: int = 20,
+):
+    """Full-text search over every saved letter and date idea (newest first)."""
+    return archive_store.search_entries(
+        query=q, kind=kind, mood=mood, vibe=vibe, duration=duration,
+        date_from=date_from, date_to=date_to, favourites_only=favourites,
+        page=page, per_page=per_page,
+    )
+
+@router.get("/{entry_id}")
+def get_archived(entry_id: int):
+    """Re-shows a saved entry without spending another AI call."""
+    entry = archive_store.get_entry(entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return entry
+
+@router.post("/{entry_id}/favourite")
+def favourite_archived(entry_id: int, value: bool = True):
+    if not archive_store.set_favourite(entry_id, value):
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return {"status": "Updated", "id": entry_id, "favourite": value}
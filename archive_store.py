@@ -0,0 +1,148 @@
+# app/services/archive_store.py
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+# --- CONFIG ---
+ARCHIVE_FILE = "archive.db"
+MAX_PER_PAGE = 100
+
+# --- SCHEMA ---
+# One row per generated letter / date idea, plus an FTS5 index over the text.
+# The FTS table is "external content" (it points at entries) and the triggers
+# keep it in sync, so the text is only stored once.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,              -- 'letter' or 'date'
+    content TEXT NOT NULL,
+    mood TEXT,
+    vibe TEXT,
+    duration TEXT,
+    favourite INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL         -- UTC, 'YYYY-MM-DD HH:MM:SS'
+);
+CREATE INDEX IF NOT EXISTS idx_entries_kind_created ON entries(kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_entries_mood ON entries(mood);
+CREATE INDEX IF NOT EXISTS idx_entries_vibe_duration ON entries(vibe, duration);
+CREATE INDEX IF NOT EXISTS idx_entries_favourite ON entries(favourite, created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    content, content='entries', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF content ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO entries_fts(rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+_ready = False
+
+def _connect():
+    global _ready
+    conn = sqlite3.connect(ARCHIVE_FILE, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if not _ready:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        _ready = True
+    return conn
+
+def _fts_query(text):
+    """Turns free text into a safe FTS5 query: every word must appear (prefix match)."""
+    words = [w.replace('"', '""') for w in text.split()]
+    return " ".join(f'"{w}"*' for w in words if w)
+
+# --- WRITES ---
+def save_entry(kind, content, mood=None, vibe=None, duration=None):
+    """Stores a generated letter/date and returns its id."""
+    created_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    with closing(_connect()) as conn, conn:
+        cur = conn.execute(
+            "INSERT INTO entries (kind, content, mood, vibe, duration, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, content, mood, vibe, duration, created_at),
+        )
+        return cur.lastrowid
+
+def try_save_entry(kind, content, mood=None, vibe=None, duration=None):
+    """
+    save_entry for the hot path: archiving is a side effect, so a locked/full DB
+    (or a SQLite without FTS5) is logged and returns None instead of failing the request.
+    """
+    try:
+        return save_entry(kind, content, mood=mood, vibe=vibe, duration=duration)
+    except sqlite3.Error as e:
+        print(f"⚠️ Archive save failed ({kind}): {e}")
+        return None
+
+def set_favourite(entry_id, favourite=True):
+    """Returns False if the entry doesn't exist."""
+    with closing(_connect()) as conn, conn:
+        cur = conn.execute("UPDATE entries SET favourite = ? WHERE id = ?", (int(favourite), entry_id))
+        return cur.rowcount > 0
+
+# --- READS ---
+def get_entry(entry_id):
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,)).fetchone()
+        return dict(row) if row else None
+
+def list_values(column):
+    """Distinct moods / vibes / durations, for filter dropdowns."""
+    if column not in ("mood", "vibe", "duration"):
+        raise ValueError(f"Can't list values for {column}")
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            f"SELECT DISTINCT {column} FROM entries WHERE {column} IS NOT NULL ORDER BY {column}"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+def search_entries(query=None, kind=None, mood=None, vibe=None, duration=None,
+                   date_from=None, date_to=None, favourites_only=False, page=1, per_page=20):
+    """
+    Full-text search + filters, newest first.
+    date_from / date_to are dates or 'YYYY-MM-DD' strings (both inclusive).
+    Returns {"total", "page", "per_page", "results"}.
+    """
+    page = max(1, int(page))
+    per_page = min(MAX_PER_PAGE, max(1, int(per_page)))
+
+    where, params = [], []
+    fts = _fts_query(query) if query else ""
+    if fts:
+        where.append("e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+        params.append(fts)
+    for column, value in (("kind", kind), ("mood", mood), ("vibe", vibe), ("duration", duration)):
+        if value:
+            where.append(f"e.{column} = ?")
+            params.append(value)
+    if date_from:
+        where.append("e.created_at >= ?")
+        params.append(str(date_from))
+    if date_to:
+        where.append("e.created_at < date(?, '+1 day')")
+        params.append(str(date_to))
+    if favourites_only:
+        where.append("e.favourite = 1")
+
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    with closing(_connect()) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM entries e {clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT e.* FROM entries e {clause} ORDER BY e.created_at DESC, e.id DESC LIMIT ? OFFSET ?",
+            params + [per_page, (page - 1) * per_page],
+        ).fetchall()
+
+    return {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "results": [dict(r) for r in rows],
+    }
@@ -0,0 +1,134 @@
+# app/bench_serve.py
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+# --- SERVING BENCHMARK ---
+# Compares the old way of running the API (bare uvicorn: 1 worker, asyncio loop,
+# h11 parser, stdlib JSON) against the tuned launcher in serve.py with the same
+# single worker, so the gap is only uvloop/httptools/orjson. Pass --workers N to
+# also see serve.py scaled out.
+# Run from the folder that contains the `app` package:
+#   python -m app.bench_serve --requests 5000 --concurrency 32
+
+DEFAULT_SETUP = {
+    "cmd": [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+            "--loop", "asyncio", "--http", "h11", "--no-access-log"],
+    "env": {"FAST_JSON": "0"},
+}
+SERVE_SETUP = {
+    "cmd": [sys.executable, "-m", "app.serve"],
+    "env": {"HOST": "127.0.0.1"},
+}
+
+def build_setups(workers):
+    """(name, setup, workers) to run. Baseline and serve.py always get 1 worker each."""
+    setups = [("default", DEFAULT_SETUP, 1), ("serve.py", SERVE_SETUP, 1)]
+    if workers and workers > 1:
+        setups.append((f"serve.py x{workers}", SERVE_SETUP, workers))
+    return setups
+
+DEFAULT_PATHS = ["/", "/dashboard/statuses", "/archive/search?per_page=20"]
+
+def wait_until_up(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def hammer(port, paths, total, concurrency):
+    """Fires `total` GETs over `concurrency` keep-alive connections. Returns latencies (ms) + errors."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    per_client = total // concurrency
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        mine = []
+        for i in range(per_client):
+            path = paths[i % len(paths)]
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path, headers={"Accept-Encoding": "gzip"})
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 400:
+                    raise OSError(resp.status)
+                mine.append((time.perf_counter() - t0) * 1000)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors[0], time.perf_counter() - t0
+
+def run_setup(name, setup, workers, port, args):
+    cmd = setup["cmd"] + (["--port", str(port)] if setup is DEFAULT_SETUP else [])
+    env = {**os.environ, **setup["env"], "PORT": str(port), "WEB_CONCURRENCY": str(workers)}
+
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_until_up(port):
+            print(f"❌ {name} didn't start on port {port}")
+            return None
+        hammer(port, args.paths, args.warmup, args.concurrency)
+        latencies, errors, elapsed = hammer(port, args.paths, args.requests, args.concurrency)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+    latencies.sort()
+    return {
+        "setup": name,
+        "rps": len(latencies) / elapsed if elapsed else 0,
+        "p50": statistics.median(latencies) if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0,
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bare uvicorn vs the tuned serve.py launcher")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None, help="Also run serve.py with this many workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    runs = [run_setup(name, setup, workers, args.port, args) for name, setup, workers in build_setups(args.workers)]
+    results = [r for r in runs if r]
+
+    print(f"\n{'setup':<14} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['setup']:<14} {r['rps']:>10.0f} {r['p50']:>9.2f} {r['p99']:>9.2f} {r['errors']:>7}")
+
+    by_name = {r["setup"]: r for r in results}
+    base = by_name.get("default")
+    if base and base["rps"]:
+        for r in results[1:]:
+            print(f"{r['setup']} is {r['rps'] / base['rps']:.2f}x the default throughput")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 # app/routers/dashboard.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
-import requests
+from app.services import weather
+import hashlib
 import json
 import os
+import threading
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -22,42 +24,100 @@ class StatusUpdate(BaseModel):
     rating: int # 1-10
 
 # --- HELPERS ---
-def load_db():
+# The parsed DB, its compact JSON body and a version hash are kept in memory
+# and only rebuilt when the file on disk changes, so polling /statuses doesn't
+# re-read and re-serialize the file every time.
+# It's one (stamp, data, body, version) tuple swapped in as a whole, and the
+# stamp always comes from the file we actually read (fstat on the open handle).
+_STATE = (None, None, None, None)
+_EMPTY_STATE = _STATE
+
+def _snapshot(data, stamp):
+    body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    # Content hash -> same version across workers and restarts
+    version = hashlib.sha1(body).hexdigest()[:16]
+    return (stamp, data, body, version)
+
+def load_state():
+    """Returns (data, body, version) for the current DB, re-reading only if the file changed."""
+    global _STATE
     if not os.path.exists(DB_FILE):
         with open(DB_FILE, "w") as f:
             json.dump(DEFAULT_DB, f)
-        return DEFAULT_DB
-    
+
+    state = _STATE
     try:
-        with open(DB_FILE, "r") as f:
-            return json.load(f)
+        stat = os.stat(DB_FILE)
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) != state[0]:
+            with open(DB_FILE, "r") as f:
+                stat = os.fstat(f.fileno())
+                state = _snapshot(json.load(f), (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            _STATE = state
     except:
-        return DEFAULT_DB
+        state = _snapshot(DEFAULT_DB, None)
+
+    _, data, body, version = state
+    return data, body, version
+
+def load_db():
+    # Hand out a fresh copy so callers can mutate it without touching the cache
+    _, body, _ = load_state()
+    return json.loads(body)
 
 def save_db(data):
-    with open(DB_FILE, "w") as f:
+    global _STATE
+    # Write a temp file and swap it in, so readers only ever see a whole file
+    tmp = f"{DB_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
         json.dump(data, f, indent=4)
+    os.replace(tmp, DB_FILE)
+    # Don't guess which stamp goes with our data (another save may have landed
+    # in between): drop the cache and let the next read rebuild it from disk
+    _STATE = _EMPTY_STATE
+    return _snapshot(data, None)[3]
+
+def _etag(version):
+    return f'"{version}"'
+
+def _etag_matches(request: Request, etag: str):
+    """Checks the If-None-Match header (handles lists, weak tags and '*')."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
 
 # --- ENDPOINTS ---
 
 @router.get("/weather")
 def get_weather(lat: float, lon: float):
-    try:
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-        resp = requests.get(url)
-        return resp.json()["current_weather"]
-    except:
+    # Served from the shared disk cache, refreshed in the background
+    data = weather.get_weather(lat, lon)
+    if data is None:
         # Fallback if API fails
         return {"temperature": 0}
+    return data
 
 @router.get("/statuses")
-def get_statuses():
-    """Returns the mood board for both people."""
-    return load_db()
+def get_statuses(request: Request):
+    """Returns the mood board for both people (304 if the client's ETag is current)."""
+    _, body, version = load_state()
+    headers = {"ETag": _etag(version), "Cache-Control": "no-cache"}
+
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post("/update")
-def update_status(update: StatusUpdate):
-    """Updates a specific person's mood."""
+def update_status(update: StatusUpdate, response: Response, compact: bool = False):
+    """
+    Updates a specific person's mood.
+    Pass ?compact=true to get back only the new version instead of the whole DB.
+    """
     db = load_db()
     
     # Update the specific user
@@ -67,5 +127,9 @@ def update_status(update: StatusUpdate):
         "last_updated": "Just now"
     }
     
-    save_db(db)
-    return {"status": "Updated", "data": db}
\ No newline at end of file
+    version = save_db(db)
+    response.headers["ETag"] = _etag(version)
+
+    if compact:
+        return {"status": "Updated", "version": version}
+    return {"status": "Updated", "version": version, "data": db}
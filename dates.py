@@ -1,7 +1,10 @@
 # app/routers/dates.py
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from app.models import DateGenRequest
-from app.services.llm import generate_gpt_response
+from app.services.llm import generate_gpt_response, is_ai_failure
+from app.services import archive_store
+from app.services.late_results import LateResults
+import os
 import random
 
 router = APIRouter(
@@ -9,6 +12,9 @@ router = APIRouter(
     tags=["LDR Date Deck"]
 )
 
+# Max seconds /generate waits for the AI before answering with a backup idea
+DATE_IDEA_BUDGET = float(os.getenv("DATE_IDEA_BUDGET", "4"))
+
 # --- THE BACKUP BRAIN (Local Database) ---
 # Used when Google AI is rate-limited or offline.
 BACKUP_DATES = [
@@ -39,11 +45,8 @@ def get_backup_date(duration, vibe):
     
     return random.choice(matches)["idea"]
 
-@router.post("/generate")
-def generate_date_idea(request: DateGenRequest):
-    """
-    Tries AI first. If AI fails (Quota Error), falls back to Local Database.
-    """
+def ask_ai_for_date(duration, vibe):
+    """Raw AI call. Returns None if the AI failed (quota, offline...)."""
     system_instruction = (
         "You are an expert dating coach for long-distance couples. "
         "Suggest ONE creative, specific virtual date idea based on the user's constraints. "
@@ -59,16 +62,51 @@ def generate_date_idea(request: DateGenRequest):
         "9. if the same prompt is given again then think of something new maybe a new game or a new version of something that was similar"
     )
     
-    user_prompt = f"Plan a date with this Duration: {request.duration}. And this Vibe: {request.vibe}."
+    user_prompt = f"Plan a date with this Duration: {duration}. And this Vibe: {vibe}."
     
-    # --- 1. TRY AI ---
     ai_result = generate_gpt_response(system_instruction, user_prompt)
-    
-    # --- 2. CHECK FOR FAILURE ---
+
     # If the AI returns the error message we programmed in llm.py
-    if "AI Error" in ai_result or "Quota exceeded" in ai_result:
-        print(f"⚠️ AI Failed/Rate Limited. Using Backup for {request.vibe}...")
-        return {"date_idea": get_backup_date(request.duration, request.vibe)}
-    
-    # --- 3. SUCCESS ---
-    return {"date_idea": ai_result}
\ No newline at end of file
+    if is_ai_failure(ai_result):
+        print(f"⚠️ AI Failed/Rate Limited. Using Backup for {vibe}...")
+        return None
+    return ai_result
+
+# Late AI answers keep generating in the background and are kept for a ticket
+# (or the next identical request). This lives in this process's memory, so with
+# several workers /pending needs sticky routing back to the same one (see serve.py).
+late_dates = LateResults(ask_ai_for_date, budget=DATE_IDEA_BUDGET)
+
+@router.post("/generate")
+def generate_date_idea(request: DateGenRequest):
+    """
+    Tries AI first, but only waits DATE_IDEA_BUDGET seconds.
+    If AI fails (Quota Error) falls back to Local Database. If it's just slow,
+    also answers with a backup plus a pending_id to collect the AI idea later.
+    """
+    # --- 1. TRY AI (within the budget) ---
+    answered, value = late_dates.get((request.duration, request.vibe))
+
+    # --- 2. SUCCESS ---
+    if answered and value is not None:
+        entry_id = archive_store.try_save_entry("date", value, vibe=request.vibe, duration=request.duration)
+        return {"date_idea": value, "source": "ai", "archive_id": entry_id}
+
+    # --- 3. FAILED OR TOO SLOW -> BACKUP ---
+    backup = {"date_idea": get_backup_date(request.duration, request.vibe), "source": "backup"}
+    if not answered:
+        backup["pending_id"] = value
+    return backup
+
+@router.get("/pending/{pending_id}")
+def get_pending_date(pending_id: str):
+    """Collects an AI idea that missed the /generate budget."""
+    status, key, ai_result = late_dates.poll(pending_id)
+    if status == "gone":
+        raise HTTPException(status_code=404, detail="Unknown or already delivered pending_id")
+    if status != "ready":
+        return {"status": status}
+
+    duration, vibe = key
+    entry_id = archive_store.try_save_entry("date", ai_result, vibe=vibe, duration=duration)
+    return {"status": "ready", "date_idea": ai_result, "source": "ai", "archive_id": entry_id}
\ No newline at end of file
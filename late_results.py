@@ -0,0 +1,133 @@
+# app/services/late_results.py
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# --- DEADLINE-BOUNDED AI CALLS ---
+# The caller waits at most `budget` seconds for the AI. If it's slower than that
+# they get a ticket instead (and show a backup idea), while the AI keeps going
+# in the background. The late answer is pinned to that ticket; only if the ticket
+# expires unclaimed is it handed to the next identical request.
+
+class LateResults:
+    def __init__(self, generate, budget, max_workers=4, ticket_ttl=600):
+        """
+        generate:    function(*key) -> result (None means the AI failed)
+        budget:      default seconds a caller is willing to wait
+        ticket_ttl:  seconds an unclaimed ticket is remembered
+        """
+        self.generate = generate
+        self.budget = budget
+        self.ticket_ttl = ticket_ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="late-ai")
+        self._futures = {}   # key -> Future (in flight, or finished but not handed out yet), free for any caller
+        self._tickets = {}   # ticket -> (key, Future, issued_at), pinned to that ticket only
+        self._lock = threading.Lock()
+
+    def _run(self, key):
+        try:
+            return self.generate(*key)
+        except Exception:
+            return None
+
+    def _forget_failure(self, key, future):
+        # Failed calls aren't worth keeping: the next request should try again
+        if future.result() is None:
+            with self._lock:
+                if self._futures.get(key) is future:
+                    del self._futures[key]
+
+    def _claim(self, key, future):
+        """True if we got to hand this result out (nobody else did first)."""
+        with self._lock:
+            if self._futures.get(key) is not future:
+                return False
+            del self._futures[key]
+            return True
+
+    def _start(self, key):
+        """Returns (future, created): created is False if we reused a running/finished call."""
+        with self._lock:
+            self._expire_tickets()
+            future = self._futures.get(key)
+            if future is not None:
+                return future, False
+            future = self._pool.submit(self._run, key)
+            self._futures[key] = future
+
+        # Outside the lock: if the call already finished, the callback runs right here
+        future.add_done_callback(lambda f: self._forget_failure(key, f))
+        return future, True
+
+    def start(self, key):
+        """Makes sure a call for `key` is running (or finished and waiting), without waiting on it."""
+        return self._start(key)[0]
+
+    def prefetch(self, key):
+        """Like start(), but returns True only if this actually kicked off a new (paid) call."""
+        return self._start(key)[1]
+
+    def get(self, key, budget=None):
+        """
+        Waits up to the budget for `key`.
+        Returns (True, result) if the AI answered in time (result is None if it failed),
+        otherwise (False, ticket) to collect the late answer with poll().
+        """
+        deadline = time.monotonic() + (self.budget if budget is None else budget)
+        while True:
+            future = self.start(key)
+            try:
+                result = future.result(timeout=max(0, deadline - time.monotonic()))
+            except TimeoutError:
+                return False, self._issue_ticket(key, future)
+
+            # If someone else already took this exact answer, don't show it twice
+            if result is None or self._claim(key, future):
+                return True, result
+
+    def _expire_tickets(self):
+        """Call with the lock held. Unclaimed answers of expired tickets go back to the shared pool."""
+        now = time.time()
+        for ticket, (key, future, issued_at) in list(self._tickets.items()):
+            if now - issued_at <= self.ticket_ttl:
+                continue
+            del self._tickets[ticket]
+            failed = future.done() and future.result() is None
+            if not failed and key not in self._futures:
+                self._futures[key] = future
+
+    def _issue_ticket(self, key, future):
+        """Pins `future` to a new ticket so no other caller can take its answer."""
+        ticket = uuid.uuid4().hex
+        with self._lock:
+            self._expire_tickets()
+            if any(f is future for _, f, _ in self._tickets.values()):
+                # Another caller already holds this answer: this one gets its own call
+                future = self._pool.submit(self._run, key)
+            elif self._futures.get(key) is future:
+                del self._futures[key]
+            self._tickets[ticket] = (key, future, time.time())
+        return ticket
+
+    def poll(self, ticket):
+        """
+        Checks on a late answer. Returns (status, key, result) where status is
+        'pending', 'ready', 'failed' or 'gone' (unknown ticket / already handed out).
+        """
+        with self._lock:
+            entry = self._tickets.get(ticket)
+        if entry is None:
+            return "gone", None, None
+
+        key, future, _ = entry
+        if not future.done():
+            return "pending", key, None
+
+        with self._lock:
+            if self._tickets.pop(ticket, None) is None:
+                return "gone", key, None
+        result = future.result()
+        if result is None:
+            return "failed", key, None
+        return "ready", key, result
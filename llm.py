@@ -36,4 +36,8 @@ def generate_gpt_response(system_prompt: str, user_prompt: str):
         return completion.choices[0].message.content
 
     except Exception as e:
-        return f"AI Error: {str(e)}"
\ No newline at end of file
+        return f"AI Error: {str(e)}"
+
+def is_ai_failure(text: str):
+    """True if generate_gpt_response gave us an error (API error, quota) instead of real output."""
+    return text.startswith("AI Error") or "Quota exceeded" in text
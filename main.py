@@ -1,11 +1,24 @@
 # app/main.py
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+import importlib.util
+import os
 # REMOVED: StaticFiles import is no longer needed
 
 # Import only the active features
-from app.routers import dates, ai, dashboard
+from app.routers import dates, ai, dashboard, archive
 
-app = FastAPI(title="Anniversary App")
+# orjson is much faster than stdlib json; FAST_JSON=0 switches it off (used by the benchmark)
+FAST_JSON = os.getenv("FAST_JSON", "1") == "1" and importlib.util.find_spec("orjson") is not None
+
+app = FastAPI(
+    title="Anniversary App",
+    default_response_class=ORJSONResponse if FAST_JSON else JSONResponse,
+)
+
+# Compress bigger responses (small JSON like /dashboard/statuses is left alone)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # REMOVED: app.mount("/photos"...) -> This was causing your crash
 
@@ -13,6 +26,7 @@ app = FastAPI(title="Anniversary App")
 app.include_router(dates.router)
 app.include_router(ai.router)
 app.include_router(dashboard.router)
+app.include_router(archive.router)
 
 @app.get("/")
 def root():
@@ -0,0 +1,175 @@
+# profiler.py
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+
+# --- CONFIG ---
+# Opt-in: open the app with ?debug=1 or set LDR_PROFILER=1
+HISTORY_SIZE = 20
+STATE_KEY = "_rerun_profiler"
+
+_local = threading.local()
+
+def is_enabled():
+    if os.getenv("LDR_PROFILER") == "1":
+        return True
+    try:
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+# --- PER-SESSION STATE ---
+# A rerun "record" is opened lazily, so timings from on_click callbacks (which
+# Streamlit runs *before* the script body) land in the same rerun as the script.
+def _state():
+    if STATE_KEY not in st.session_state:
+        st.session_state[STATE_KEY] = {"current": None, "history": deque(maxlen=HISTORY_SIZE)}
+    return st.session_state[STATE_KEY]
+
+def _new_record(t0=None):
+    t0 = time.perf_counter() if t0 is None else t0
+    return {
+        "started_at": datetime.now().strftime("%H:%M:%S"),
+        "t0": t0,
+        "t_last": t0,
+        "script_started": False,
+        "sections": [],
+        "cache": {},
+    }
+
+def _current(from_callback=False, t0=None):
+    """
+    The open record. A callback always belongs to a *new* rerun: if the open record's
+    script already ran (it was cut short by st.rerun / st.stop), close it first.
+    """
+    state = _state()
+    record = state["current"]
+    if from_callback and record is not None and record["script_started"]:
+        _finish(record, "interrupted")
+        record = None
+    if record is None:
+        record = state["current"] = _new_record(t0)
+    return record
+
+def _finish(record, status):
+    # Interrupted runs stop at their last recorded activity, not whenever we noticed
+    end = time.perf_counter() if status == "ok" else record["t_last"]
+    record["total_ms"] = round((end - record.pop("t0")) * 1000, 1)
+    record["status"] = status
+    record.pop("t_last", None)
+    record.pop("script_started", None)
+    _state()["history"].append(record)
+    _state()["current"] = None
+
+def begin_rerun():
+    """Call at the top of the script."""
+    if not is_enabled():
+        return
+    state = _state()
+    record = state["current"]
+    # Last run never reached end_rerun (st.rerun / st.stop / exception)
+    if record is not None and record["script_started"]:
+        _finish(record, "interrupted")
+    _current()["script_started"] = True
+
+def end_rerun():
+    """Call at the very end of the script."""
+    if not is_enabled():
+        return
+    state = _state()
+    if state["current"] is not None:
+        _finish(state["current"], "ok")
+
+# --- TIMING ---
+@contextmanager
+def section(name, callback=False):
+    """
+    Times a named chunk of the script for the current rerun.
+    Pass callback=True inside on_click/on_change handlers (they run before the script body).
+    """
+    if not is_enabled():
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        t1 = time.perf_counter()
+        record = _current(from_callback=callback, t0=t0)
+        record["sections"].append((name, round((t1 - t0) * 1000, 1)))
+        record["t_last"] = t1
+
+def cache_data(**cache_kwargs):
+    """
+    Drop-in for @st.cache_data that also counts cache hits vs misses.
+    The inner function only runs on a miss, so it flips a flag we check afterwards.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def on_miss(*args, **kwargs):
+            _local.missed = True
+            return fn(*args, **kwargs)
+
+        cached = st.cache_data(**cache_kwargs)(on_miss)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            _local.missed = False
+            result = cached(*args, **kwargs)
+            if is_enabled():
+                stats = _current()["cache"].setdefault(fn.__name__, {"hits": 0, "misses": 0})
+                stats["misses" if _local.missed else "hits"] += 1
+            return result
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+# --- SIDEBAR PANEL ---
+def _history_rows():
+    rows = []
+    for i, record in enumerate(_state()["history"], start=1):
+        row = {"run": i, "started": record["started_at"], "status": record["status"], "total_ms": record["total_ms"]}
+        for name, ms in record["sections"]:
+            row[name] = round(row.get(name, 0) + ms, 1)
+        for name, stats in record["cache"].items():
+            row[f"{name} hit/miss"] = f"{stats['hits']}/{stats['misses']}"
+        rows.append(row)
+    return rows
+
+def render_sidebar():
+    """Shows the last rerun + rolling history. Call after end_rerun()."""
+    if not is_enabled():
+        return
+    history = _state()["history"]
+
+    with st.sidebar:
+        st.markdown("### ⏱️ Rerun Profiler")
+        if not history:
+            st.info("No reruns recorded yet")
+            return
+
+        last = history[-1]
+        st.metric("Last rerun", f"{last['total_ms']} ms", help=f"Started {last['started_at']} ({last['status']})")
+
+        if last["sections"]:
+            st.dataframe(pd.DataFrame(last["sections"], columns=["section", "ms"]), hide_index=True, use_container_width=True)
+        if last["cache"]:
+            cache_df = pd.DataFrame([{"function": k, **v} for k, v in last["cache"].items()])
+            st.dataframe(cache_df, hide_index=True, use_container_width=True)
+
+        st.markdown(f"**Last {len(history)} reruns**")
+        history_df = pd.DataFrame(_history_rows())
+        st.dataframe(history_df, hide_index=True, use_container_width=True)
+
+        st.download_button("Export CSV", history_df.to_csv(index=False), "reruns.csv", "text/csv", use_container_width=True)
+        st.download_button("Export JSON", json.dumps(list(history), indent=2), "reruns.json", "application/json", use_container_width=True)
+        if st.button("Clear history", use_container_width=True):
+            history.clear()
@@ -0,0 +1,60 @@
+# app/serve.py
+import importlib.util
+import os
+import uvicorn
+
+# --- PRODUCTION LAUNCHER ---
+# Run with:  python -m app.serve
+# instead of a bare `uvicorn app.main:app`. Everything can be tuned with env vars:
+#   HOST / PORT          where to listen (default 0.0.0.0:8000)
+#   WEB_CONCURRENCY      worker processes (default 1, see below), or "auto" for one per usable CPU
+#   KEEP_ALIVE           seconds an idle keep-alive connection stays open (default 15)
+#   BACKLOG              max queued connections waiting for accept (default 2048)
+#   GRACEFUL_TIMEOUT     seconds to let in-flight requests (slow LLM calls) finish on shutdown (default 30)
+#   ACCESS_LOG           1 to turn the per-request access log back on (default off)
+#
+# Workers: late AI answers (/dates/generate -> /dates/pending/{id}) live in memory
+# in the process that started them, so a pending_id only works on that worker.
+# Keep 1 worker, or if you raise WEB_CONCURRENCY (or use "auto") put it behind a
+# proxy with sticky routing (e.g. by client IP) so the pending poll reaches the same process.
+
+def _has(module):
+    return importlib.util.find_spec(module) is not None
+
+def _cpu_count():
+    # Respects container/taskset CPU limits where the OS supports it
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def _workers():
+    value = os.getenv("WEB_CONCURRENCY", "1")
+    return _cpu_count() if value == "auto" else int(value)
+
+def build_config():
+    """Uvicorn settings for production, picking the fast loop/parser when installed."""
+    return {
+        "host": os.getenv("HOST", "0.0.0.0"),
+        "port": int(os.getenv("PORT", "8000")),
+        "workers": _workers(),
+        "loop": "uvloop" if _has("uvloop") else "asyncio",
+        "http": "httptools" if _has("httptools") else "h11",
+        "timeout_keep_alive": int(os.getenv("KEEP_ALIVE", "15")),
+        "backlog": int(os.getenv("BACKLOG", "2048")),
+        # On SIGTERM uvicorn stops accepting and waits this long for open requests.
+        # Late AI calls in LateResults run on pool threads, which Python also waits for on exit.
+        "timeout_graceful_shutdown": int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        "access_log": os.getenv("ACCESS_LOG", "0") == "1",
+        "proxy_headers": True,
+    }
+
+def main():
+    config = build_config()
+    print(f"🚀 Serving on {config['host']}:{config['port']} "
+          f"({config['workers']} workers, loop={config['loop']}, http={config['http']})")
+    # Workers need the app as an import string, not the object
+    uvicorn.run("app.main:app", **config)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# speculate.py
+import threading
+
+# --- SPECULATIVE GENERATION ---
+# Starts an expensive call (e.g. the AI date planner) in the background as soon
+# as the user's choice settles, so by the time they click the button the answer
+# is already done or half-way there. `generate` is expected to park its result
+# somewhere the click can find it (e.g. LateResults.start).
+
+class _Job:
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.started = False   # True once the real (paid) call has begun
+
+class Speculator:
+    def __init__(self, generate, settle_delay=1.5, max_calls=5):
+        """
+        generate:      function(*key) -> True if it started new (paid) work, runs in a background thread
+        settle_delay:  seconds the selection must stay put before we spend a call
+        max_calls:     cap on speculative calls for this Speculator's lifetime (only new work counts)
+        """
+        self.generate = generate
+        self.settle_delay = settle_delay
+        self.max_calls = max_calls
+        self.calls_used = 0
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def speculate(self, key):
+        """Selection changed to `key`: cancel other pending guesses and start this one."""
+        with self._lock:
+            for other_key, job in list(self._jobs.items()):
+                if job.done.is_set():
+                    del self._jobs[other_key]
+                # Jobs already talking to the AI keep going (the result stays reusable),
+                # anything still waiting to settle is dropped for free.
+                elif other_key != key and not job.started:
+                    job.cancelled.set()
+                    del self._jobs[other_key]
+
+            if key in self._jobs or self.calls_used >= self.max_calls:
+                return
+
+            job = _Job()
+            self._jobs[key] = job
+
+        threading.Thread(target=self._run, args=(key, job), daemon=True).start()
+
+    def cancel_all(self):
+        """Drops every guess that hasn't started its call yet (e.g. speculation was switched off)."""
+        with self._lock:
+            for key, job in list(self._jobs.items()):
+                if not job.started:
+                    job.cancelled.set()
+                    del self._jobs[key]
+
+    def _run(self, key, job):
+        # Debounce: wait for the selection to settle (or for a cancel)
+        if job.cancelled.wait(self.settle_delay):
+            job.done.set()
+            return
+
+        with self._lock:
+            if job.cancelled.is_set() or self.calls_used >= self.max_calls:
+                if self._jobs.get(key) is job:
+                    del self._jobs[key]
+                job.done.set()
+                return
+            # Reserve a slot up front so parallel jobs can't overshoot the cap
+            job.started = True
+            self.calls_used += 1
+
+        created = False
+        try:
+            created = self.generate(*key)
+        except Exception:
+            pass
+        finally:
+            if not created:
+                # Reused an existing call (or failed to start): give the slot back
+                with self._lock:
+                    self.calls_used -= 1
+            job.done.set()
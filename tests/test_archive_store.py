@@ -0,0 +1,48 @@
+# tests/test_archive_store.py
+from contextlib import closing
+import pytest
+import archive_store
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_store, "ARCHIVE_FILE", str(tmp_path / "archive.db"))
+    monkeypatch.setattr(archive_store, "_ready", False)
+    return archive_store
+
+def _save(archive, content, created_at, kind="letter"):
+    entry_id = archive.save_entry(kind, content)
+    with closing(archive._connect()) as conn, conn:
+        conn.execute("UPDATE entries SET created_at = ? WHERE id = ?", (created_at, entry_id))
+    return entry_id
+
+def test_fts_syntax_in_query_is_searched_as_text(archive):
+    quoted = _save(archive, 'She said "forever" at the pier', "2024-02-14 10:00:00")
+    picnic = _save(archive, "Picnic NEAR the lake", "2024-02-15 10:00:00")
+
+    # Neither should raise an FTS5 syntax error, they're just words
+    assert [r["id"] for r in archive.search_entries('"forever')["results"]] == [quoted]
+    assert [r["id"] for r in archive.search_entries("NEAR(")["results"]] == [picnic]
+    assert archive.search_entries("NEAR(pier forever)")["total"] == 0  # not an FTS NEAR group
+
+def test_date_bounds_are_inclusive(archive):
+    _save(archive, "before", "2024-02-13 23:59:59")
+    first = _save(archive, "first day", "2024-02-14 00:00:00")
+    last = _save(archive, "last day", "2024-02-15 23:59:59")
+    _save(archive, "after", "2024-02-16 00:00:00")
+
+    found = archive.search_entries(date_from="2024-02-14", date_to="2024-02-15")
+    assert [r["id"] for r in found["results"]] == [last, first]
+
+def test_pagination_is_clamped(archive):
+    for i in range(3):
+        _save(archive, f"note {i}", f"2024-02-1{i} 12:00:00")
+
+    found = archive.search_entries(page=0, per_page=0)
+    assert (found["page"], found["per_page"], found["total"]) == (1, 1, 3)
+    assert len(found["results"]) == 1
+
+    found = archive.search_entries(per_page=10_000)
+    assert found["per_page"] == archive.MAX_PER_PAGE
+    assert len(found["results"]) == 3
+
+    assert archive.search_entries(page=5, per_page=2)["results"] == []
@@ -0,0 +1,58 @@
+# tests/test_dashboard.py
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")  # TestClient needs it
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+dashboard = pytest.importorskip("dashboard", reason="needs the app.services package layout")
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(dashboard, "_STATE", dashboard._EMPTY_STATE)
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    return TestClient(app)
+
+UPDATE = {"user": "Veer", "mood": "Sleepy", "rating": 6}
+
+@pytest.mark.parametrize("header", [
+    '"{v}"',
+    'W/"{v}"',
+    '"stale", "{v}"',
+    '"stale",W/"{v}"',
+    "*",
+])
+def test_matching_etag_gets_304(client, header):
+    etag = client.get("/dashboard/statuses").headers["etag"]
+    version = etag.strip('"')
+
+    resp = client.get("/dashboard/statuses", headers={"If-None-Match": header.format(v=version)})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+def test_changed_db_gets_new_body(client):
+    first = client.get("/dashboard/statuses")
+    client.post("/dashboard/update", json=UPDATE)
+
+    resp = client.get("/dashboard/statuses", headers={"If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != first.headers["etag"]
+    assert resp.json()["Veer"]["mood"] == "Sleepy"
+
+def test_compact_update_returns_only_the_version(client):
+    resp = client.post("/dashboard/update?compact=true", json=UPDATE)
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"status", "version"}
+
+    # The version it hands back is the one /statuses will 304 on
+    assert resp.headers["etag"] == f'"{resp.json()["version"]}"'
+    again = client.get("/dashboard/statuses", headers={"If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+
+def test_full_update_still_returns_data(client):
+    body = client.post("/dashboard/update", json=UPDATE).json()
+    assert body["data"]["Veer"]["mood"] == "Sleepy"
+    assert "Rishi" in body["data"]
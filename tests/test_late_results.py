@@ -0,0 +1,56 @@
+# tests/test_late_results.py
+import threading
+import time
+from late_results import LateResults
+
+def test_instant_failure_does_not_deadlock():
+    late = LateResults(lambda d, v: None, budget=1)
+    result = {}
+
+    def call():
+        result["first"] = late.get(("a", "b"))
+        result["second"] = late.get(("a", "b"))
+
+    worker = threading.Thread(target=call, daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive(), "LateResults.get deadlocked on an instant failure"
+    assert result["first"] == (True, None)
+    assert result["second"] == (True, None)
+
+def _slow_generator(delay=0.3):
+    calls = []
+    def generate(duration, vibe):
+        calls.append((duration, vibe))
+        number = len(calls)
+        time.sleep(delay)
+        return f"{duration}-{vibe}-{number}"
+    return generate, calls
+
+def test_late_answer_is_pinned_to_its_ticket():
+    generate, calls = _slow_generator()
+    late = LateResults(generate, budget=0.05)
+
+    answered, ticket = late.get(("1 Hour", "Lazy"))
+    assert not answered
+
+    # An identical request while the ticket is out must not take its answer
+    answered, second = late.get(("1 Hour", "Lazy"), budget=2)
+    assert answered and second == "1 Hour-Lazy-2"
+
+    status, key, result = late.poll(ticket)
+    assert (status, key, result) == ("ready", ("1 Hour", "Lazy"), "1 Hour-Lazy-1")
+    assert late.poll(ticket)[0] == "gone"
+
+def test_expired_ticket_answer_goes_to_next_request():
+    generate, calls = _slow_generator(delay=0.1)
+    late = LateResults(generate, budget=0.01, ticket_ttl=0.2)
+
+    answered, ticket = late.get(("1 Hour", "Lazy"))
+    assert not answered
+    time.sleep(0.3)
+
+    assert late.get(("1 Hour", "Lazy")) == (True, "1 Hour-Lazy-1")
+    assert len(calls) == 1
+    assert late.poll(ticket)[0] == "gone"
@@ -0,0 +1,45 @@
+# tests/test_speculate.py
+import time
+from late_results import LateResults
+from speculate import Speculator
+
+def test_cancel_all_stops_settling_guess():
+    calls = []
+    spec = Speculator(lambda d, v: calls.append((d, v)) or True, settle_delay=0.1)
+
+    spec.speculate(("1 Hour", "Lazy"))
+    spec.cancel_all()
+    time.sleep(0.3)
+
+    assert calls == []
+    assert spec.calls_used == 0
+
+def test_reused_call_does_not_count_against_cap():
+    late = LateResults(lambda d, v: f"{d}-{v}", budget=1)
+    spec = Speculator(lambda d, v: late.prefetch((d, v)), settle_delay=0.01, max_calls=5)
+
+    late.start(("1 Hour", "Lazy"))  # already running/finished before we speculate
+    spec.speculate(("1 Hour", "Lazy"))
+    time.sleep(0.2)
+    assert spec.calls_used == 0
+
+    spec.speculate(("2 Hours", "Gaming"))
+    time.sleep(0.2)
+    assert spec.calls_used == 1
+
+def test_click_before_settle_spends_one_call():
+    calls = []
+    def generate(d, v):
+        calls.append((d, v))
+        return f"{d}-{v}"
+    late = LateResults(generate, budget=1)
+    spec = Speculator(lambda d, v: late.prefetch((d, v)), settle_delay=0.1)
+
+    spec.speculate(("1 Hour", "Lazy"))
+    # What handle_date_click does: cancel settling guesses, then make the real call
+    spec.cancel_all()
+    assert late.get(("1 Hour", "Lazy")) == (True, "1 Hour-Lazy")
+    time.sleep(0.3)
+
+    assert len(calls) == 1
+    assert spec.calls_used == 0
@@ -0,0 +1,58 @@
+# tests/test_weather.py
+import time
+import pytest
+
+pytest.importorskip("requests")
+import weather
+
+@pytest.fixture
+def fetches(tmp_path, monkeypatch):
+    """Runs weather in an empty cwd, with open-meteo replaced by a call counter."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(weather, "_cache", {})
+    monkeypatch.setattr(weather, "_cache_stamp", None)
+    monkeypatch.setattr(weather, "_in_flight", set())
+    monkeypatch.setattr(weather, "_start_refresher", lambda: None)
+
+    calls = []
+    def fake_fetch(lat, lon):
+        calls.append((lat, lon))
+        return {"temperature": len(calls)}
+    monkeypatch.setattr(weather, "_fetch", fake_fetch)
+    return calls
+
+def _wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_first_lookup_fetches_then_serves_from_cache(fetches):
+    assert weather.get_weather(22.3, 114.17) == {"temperature": 1}
+    assert weather.get_weather(22.301, 114.171) == {"temperature": 1}  # same rounded key
+    assert len(fetches) == 1
+
+def test_stale_entry_is_served_then_refreshed_in_background(fetches):
+    weather.get_weather(22.3, 114.17)
+    key = weather._key(22.3, 114.17)
+    with weather._lock:
+        weather._cache[key]["fetched_at"] -= weather.FRESH_FOR
+        weather._write_to_disk()
+
+    # The stale answer comes back straight away...
+    assert weather.get_weather(22.3, 114.17) == {"temperature": 1}
+    # ...and the refresh lands for the next reader
+    assert _wait_for(lambda: weather.get_weather(22.3, 114.17) == {"temperature": 2})
+    assert len(fetches) == 2
+
+def test_failed_refresh_keeps_serving_old_entry(fetches, monkeypatch):
+    weather.get_weather(22.3, 114.17)
+    key = weather._key(22.3, 114.17)
+    with weather._lock:
+        weather._cache[key]["fetched_at"] -= weather.FRESH_FOR
+        weather._write_to_disk()
+
+    monkeypatch.setattr(weather, "_fetch", lambda lat, lon: None)
+    assert weather.get_weather(22.3, 114.17) == {"temperature": 1}
+    assert _wait_for(lambda: not weather._in_flight)
+    assert weather.get_weather(22.3, 114.17) == {"temperature": 1}
@@ -0,0 +1,210 @@
+# app/services/weather.py
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+import requests
+
+try:
+    import fcntl  # Unix only; elsewhere every process just refreshes for itself
+except ImportError:
+    fcntl = None
+
+# --- CONFIG ---
+CACHE_FILE = "weather_cache.json"
+LOCK_FILE = "weather_cache.lock"              # Held by the one process running the refresh loop
+WRITE_LOCK_FILE = "weather_cache.write.lock"  # Held briefly around every read-modify-write
+FRESH_FOR = 30 * 60        # An entry counts as fresh for 30 mins
+REFRESH_AHEAD = 5 * 60     # Background refresh kicks in 5 mins before that
+REFRESH_EVERY = 60         # How often the background task checks the cache
+IDLE_AFTER = 2 * 60 * 60   # Stop refreshing a location nobody has looked at for 2 hours...
+EVICT_AFTER = 24 * 60 * 60 # ...and drop it entirely after a day
+TOUCH_EVERY = 5 * 60       # How often a read bumps last_read on disk (saves a write per read)
+MAX_ENTRIES = 200          # Hard cap, least recently read locations go first
+COORD_PRECISION = 2        # ~1 km, so nearby lookups share an entry
+
+# --- SHARED STATE ---
+# Mirrors the file on disk so every worker/restart sees the same entries:
+# {"22.3,114.17": {"lat": .., "lon": .., "fetched_at": .., "last_read": .., "data": {...}}}
+_cache = {}
+_cache_stamp = None
+_lock = threading.Lock()
+_in_flight = set()
+_refresher = None
+_refresher_lock_fd = None
+
+def _key(lat, lon):
+    return f"{round(lat, COORD_PRECISION)},{round(lon, COORD_PRECISION)}"
+
+def _fetch(lat, lon):
+    """Calls open-meteo. Returns the current_weather dict or None if it fails."""
+    try:
+        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
+        resp = requests.get(url, timeout=5)
+        return resp.json()["current_weather"]
+    except:
+        return None
+
+# --- DISK PERSISTENCE ---
+def _sync_from_disk():
+    """Reloads the cache file if another process has written it since we last looked."""
+    global _cache, _cache_stamp
+    try:
+        stat = os.stat(CACHE_FILE)
+    except OSError:
+        return
+    stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if stamp == _cache_stamp:
+        return
+    try:
+        with open(CACHE_FILE, "r") as f:
+            _cache = json.load(f)
+        _cache_stamp = stamp
+    except:
+        pass
+
+def _write_to_disk():
+    """Call with _lock held. Evicts idle/excess entries, then writes the file."""
+    global _cache_stamp
+    now = time.time()
+    for key in [k for k, e in _cache.items() if now - e.get("last_read", 0) > EVICT_AFTER]:
+        del _cache[key]
+    if len(_cache) > MAX_ENTRIES:
+        by_last_read = sorted(_cache, key=lambda k: _cache[k].get("last_read", 0))
+        for key in by_last_read[:len(_cache) - MAX_ENTRIES]:
+            del _cache[key]
+
+    # Write to a temp file and swap it in, so readers never see half a file
+    tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(_cache, f)
+        os.replace(tmp, CACHE_FILE)
+        stat = os.stat(CACHE_FILE)
+        _cache_stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+
+@contextmanager
+def _cross_process_lock():
+    """Blocks other processes (Streamlit, API workers) from writing the cache file meanwhile."""
+    fd = os.open(WRITE_LOCK_FILE, os.O_CREAT | os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # Closing the fd releases the flock
+
+def _write_lock():
+    return _cross_process_lock() if fcntl is not None else nullcontext()
+
+def _store(key, lat, lon, data):
+    # Re-read + write under both locks, so we never overwrite another process's fresh entries
+    with _lock, _write_lock():
+        _sync_from_disk()
+        old = _cache.get(key, {})
+        _cache[key] = {
+            "lat": lat, "lon": lon, "fetched_at": time.time(),
+            "last_read": old.get("last_read", time.time()), "data": data,
+        }
+        _write_to_disk()
+
+def _touch(key):
+    """Marks a location as still being looked at (so it keeps getting refreshed)."""
+    with _lock, _write_lock():
+        _sync_from_disk()
+        if key in _cache:
+            _cache[key]["last_read"] = time.time()
+            _write_to_disk()
+
+# --- REFRESHING ---
+def _needs_refresh(entry):
+    return time.time() - entry["fetched_at"] >= FRESH_FOR - REFRESH_AHEAD
+
+def _is_idle(entry):
+    return time.time() - entry.get("last_read", 0) > IDLE_AFTER
+
+def _refresh(key, lat, lon):
+    try:
+        # Another process may have refreshed it since we decided to
+        with _lock:
+            _sync_from_disk()
+            entry = _cache.get(key)
+        if entry is not None and not _needs_refresh(entry):
+            return
+        data = _fetch(lat, lon)
+        # On failure we just keep serving the old entry
+        if data is not None:
+            _store(key, lat, lon, data)
+    finally:
+        with _lock:
+            _in_flight.discard(key)
+
+def _refresh_in_background(key, lat, lon):
+    with _lock:
+        if key in _in_flight:
+            return
+        _in_flight.add(key)
+    threading.Thread(target=_refresh, args=(key, lat, lon), daemon=True).start()
+
+def _is_refresher():
+    """Only one process (the one holding the lock file) runs the refresh loop."""
+    global _refresher_lock_fd
+    if fcntl is None or _refresher_lock_fd is not None:
+        return True
+    fd = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR)
+    try:
+        # Released by the OS if this process dies, so another one takes over
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _refresher_lock_fd = fd
+    return True
+
+def _refresh_loop():
+    """Keeps locations people are still looking at warm, so they get renewed before they expire."""
+    while True:
+        if _is_refresher():
+            with _lock:
+                _sync_from_disk()
+                due = [(k, e["lat"], e["lon"]) for k, e in _cache.items()
+                       if _needs_refresh(e) and not _is_idle(e)]
+            for key, lat, lon in due:
+                _refresh_in_background(key, lat, lon)
+        time.sleep(REFRESH_EVERY)
+
+def _start_refresher():
+    global _refresher
+    with _lock:
+        if _refresher is None:
+            _refresher = threading.Thread(target=_refresh_loop, daemon=True)
+            _refresher.start()
+
+# --- PUBLIC ---
+def get_weather(lat, lon):
+    """
+    Stale-while-revalidate weather lookup.
+    Only the very first lookup for a location waits on open-meteo; after that the
+    cached entry is returned straight away and refreshed in the background.
+    Returns None if the location has never been fetched successfully.
+    """
+    _start_refresher()
+    key = _key(lat, lon)
+
+    with _lock:
+        _sync_from_disk()
+        entry = _cache.get(key)
+
+    if entry is None:
+        data = _fetch(lat, lon)
+        if data is not None:
+            _store(key, lat, lon, data)
+        return data
+
+    if time.time() - entry.get("last_read", 0) > TOUCH_EVERY:
+        _touch(key)
+    if _needs_refresh(entry):
+        _refresh_in_background(key, lat, lon)
+    return entry["data"]